@@ -0,0 +1,29 @@
+"""
+One-off conversion of the training CSV to Parquet for app.py.
+
+    python convert_dataset.py
+
+Re-run whenever Final_fraud_dataset.csv changes.
+
+Columns are stored at the narrowest integer/float width that holds them, so
+app.py reads fewer bytes and its dtype cast is mostly a no-op.
+"""
+import pandas as pd
+
+DATA_PATH = "Final_fraud_dataset.csv"
+PARQUET_PATH = "Final_fraud_dataset.parquet"
+
+
+def main():
+    df = pd.read_csv(DATA_PATH)
+    for col in df.columns:
+        if pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+        elif pd.api.types.is_float_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast="float")
+    df.to_parquet(PARQUET_PATH, compression="zstd", index=False)
+    print(f"Wrote {PARQUET_PATH} ({len(df):,} rows)")
+
+
+if __name__ == "__main__":
+    main()
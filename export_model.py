@@ -0,0 +1,102 @@
+"""
+One-off export of the trained XGBoost model for app.py:
+
+- FraudAI_model.onnx: ONNX graph for onnxruntime (preferred at runtime)
+- FraudAI_model.ubj: XGBoost's native booster format (fallback without onnxruntime)
+
+    pip install onnxmltools onnxruntime
+    python export_model.py
+
+Re-run whenever FraudAI_model.pkl is retrained.
+
+Every boosting round is one more tree walked per prediction. To check whether
+the later rounds still earn their cost, print quality against round count with
+`python export_model.py --sweep`, then export a truncated model with
+`python export_model.py --n-trees K`.
+"""
+import argparse
+
+import joblib
+import numpy as np
+import pandas as pd
+from onnxmltools import convert_xgboost
+from onnxmltools.convert.common.data_types import FloatTensorType
+from xgboost import XGBClassifier
+
+MODEL_PATH = "FraudAI_model.pkl"
+ONNX_MODEL_PATH = "FraudAI_model.onnx"
+BOOSTER_PATH = "FraudAI_model.ubj"
+DATA_PATH = "Final_fraud_dataset.csv"
+N_FEATURES = 18
+RISK_THRESHOLDS = (0.3, 0.5)  # keep in sync with app.py
+
+
+def load_dataset():
+    df = pd.read_csv(DATA_PATH)
+    return df.drop(columns="fraud_label").to_numpy(dtype=np.float32), df["fraud_label"].to_numpy()
+
+
+def sweep(model):
+    """Print ROC AUC and risk-tier agreement with the full model per round count."""
+    from sklearn.metrics import roc_auc_score
+
+    X, y = load_dataset()
+    booster = model.get_booster()
+    n_rounds = booster.num_boosted_rounds()
+    full_tiers = np.digitize(booster.inplace_predict(X), RISK_THRESHOLDS, right=True)
+
+    print("trees   roc_auc   same_risk_tier")
+    for k in sorted({25, 50, 100, 150, 200, n_rounds}):
+        if k > n_rounds:
+            continue
+        proba = booster.inplace_predict(X, iteration_range=(0, k))
+        tiers = np.digitize(proba, RISK_THRESHOLDS, right=True)
+        print(f"{k:>5}   {roc_auc_score(y, proba):.4f}    {(tiers == full_tiers).mean():.2%}")
+    print("Note: scored on the full dataset, which overlaps the training data.")
+
+
+def export(model, n_trees=None):
+    booster = model.get_booster()
+    if n_trees:
+        booster = booster[:n_trees]
+    booster.save_model(BOOSTER_PATH)
+
+    # Convert exactly what was saved: a fresh classifier around the (possibly truncated) booster
+    model = XGBClassifier()
+    model.load_model(BOOSTER_PATH)
+
+    # The converter only understands XGBoost's default f0..fN feature names
+    model.get_booster().feature_names = None
+
+    onnx_model = convert_xgboost(model, initial_types=[("input", FloatTensorType([None, N_FEATURES]))])
+    with open(ONNX_MODEL_PATH, "wb") as f:
+        f.write(onnx_model.SerializeToString())
+
+    # Sanity check: ONNX Runtime must agree with XGBoost on the training data
+    import onnxruntime as ort
+    X, _ = load_dataset()
+    sess = ort.InferenceSession(ONNX_MODEL_PATH, providers=["CPUExecutionProvider"])
+    onnx_proba = sess.run(None, {"input": X})[1][:, 1]
+    max_diff = np.abs(onnx_proba - model.predict_proba(X)[:, 1]).max()
+    print(f"Wrote {BOOSTER_PATH} and {ONNX_MODEL_PATH} (max |diff| vs XGBoost: {max_diff:.2e})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-trees", type=int, help="keep only the first N boosting rounds")
+    parser.add_argument("--sweep", action="store_true", help="report quality per round count and exit")
+    args = parser.parse_args()
+
+    model = joblib.load(MODEL_PATH)
+    n_rounds = model.get_booster().num_boosted_rounds()
+    if args.n_trees is not None and not 1 <= args.n_trees <= n_rounds:
+        parser.error(f"--n-trees must be between 1 and {n_rounds}")
+
+    if args.sweep:
+        sweep(model)
+    else:
+        export(model, args.n_trees)
+
+
+if __name__ == "__main__":
+    main()